@@ -13,9 +13,53 @@ __forb_plugin__ = {
 }
 
 import forb
+import functools
 import hashlib
 import zlib
 
+# Skip very large data (>10MB)
+_MAX_SIZE = 10_000_000
+# Larger values are hashed in windows of this size so they stay in L2
+_CHUNK_SIZE = 65536
+# Only values up to this size are memoized (128 entries, so at most ~8MB)
+_CACHE_MAX_SIZE = 65536
+
+_HASHERS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b-256": functools.partial(hashlib.blake2b, digest_size=32),
+}
+
+
+def _hexdigest(h, value):
+    """Feed value to hash object h and return its hex digest."""
+    if len(value) < _CHUNK_SIZE:
+        h.update(value)
+    else:
+        mv = memoryview(value)
+        for i in range(0, len(mv), _CHUNK_SIZE):
+            h.update(mv[i:i + _CHUNK_SIZE])
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_line(algo, value):
+    return f"{algo}: {_HASHERS[algo](value).hexdigest()}"
+
+
+def _hash_line(algo, value):
+    """
+    Format "algo: hexdigest" for value.
+
+    Small values are memoized as the finished string, so re-evaluating
+    an unchanged input allocates nothing.
+    """
+    if len(value) <= _CACHE_MAX_SIZE:
+        return _cached_line(algo, value)
+    return f"{algo}: {_hexdigest(_HASHERS[algo](), value)}"
+
 
 @forb.trait(id="crc32", name="CRC32", value_types=["bytes"])
 def compute_crc32(value):
@@ -26,13 +70,9 @@ def compute_crc32(value):
         forb "hello"
         -> crc32: 3610a686
     """
-    if not isinstance(value, bytes):
+    if not isinstance(value, bytes) or len(value) > _MAX_SIZE:
         return None
-    # Skip very large data (>10MB)
-    if len(value) > 10_000_000:
-        return None
-    crc = zlib.crc32(value) & 0xffffffff
-    return f"crc32: {crc:08x}"
+    return f"crc32: {zlib.crc32(value):08x}"
 
 
 @forb.trait(id="md5", name="MD5", value_types=["bytes"])
@@ -44,11 +84,9 @@ def compute_md5(value):
         forb "hello"
         -> md5: 5d41402abc4b2a76b9719d911017c592
     """
-    if not isinstance(value, bytes):
-        return None
-    if len(value) > 10_000_000:
+    if not isinstance(value, bytes) or len(value) > _MAX_SIZE:
         return None
-    return f"md5: {hashlib.md5(value).hexdigest()}"
+    return _hash_line("md5", value)
 
 
 @forb.trait(id="sha1", name="SHA-1", value_types=["bytes"])
@@ -60,11 +98,9 @@ def compute_sha1(value):
         forb "hello"
         -> sha1: aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d
     """
-    if not isinstance(value, bytes):
+    if not isinstance(value, bytes) or len(value) > _MAX_SIZE:
         return None
-    if len(value) > 10_000_000:
-        return None
-    return f"sha1: {hashlib.sha1(value).hexdigest()}"
+    return _hash_line("sha1", value)
 
 
 @forb.trait(id="sha256", name="SHA-256", value_types=["bytes"])
@@ -76,12 +112,9 @@ def compute_sha256(value):
         forb "hello"
         -> sha256: 2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824
     """
-    if not isinstance(value, bytes):
-        return None
-    # Skip large data (>1MB) - SHA-256 is slower
-    if len(value) > 1_000_000:
+    if not isinstance(value, bytes) or len(value) > _MAX_SIZE:
         return None
-    return f"sha256: {hashlib.sha256(value).hexdigest()}"
+    return _hash_line("sha256", value)
 
 
 @forb.trait(id="sha512", name="SHA-512", value_types=["bytes"])
@@ -93,11 +126,9 @@ def compute_sha512(value):
         forb "hello"
         -> sha512: 9b71d224bd62f3785d96d46ad3ea3d73319bfbc2890caadae2dff72519673ca7...
     """
-    if not isinstance(value, bytes):
+    if not isinstance(value, bytes) or len(value) > _MAX_SIZE:
         return None
-    if len(value) > 1_000_000:
-        return None
-    return f"sha512: {hashlib.sha512(value).hexdigest()}"
+    return _hash_line("sha512", value)
 
 
 @forb.trait(id="blake2b-256", name="BLAKE2b-256", value_types=["bytes"])
@@ -109,8 +140,6 @@ def compute_blake2b(value):
         forb "hello"
         -> blake2b-256: 324dcf027dd4a30a932c441f365a25e86b173defa4b8e58948253471b81b72cf
     """
-    if not isinstance(value, bytes):
-        return None
-    if len(value) > 1_000_000:
+    if not isinstance(value, bytes) or len(value) > _MAX_SIZE:
         return None
-    return f"blake2b-256: {hashlib.blake2b(value, digest_size=32).hexdigest()}"
+    return _hash_line("blake2b-256", value)
@@ -12,37 +12,139 @@ __forb_plugin__ = {
 
 import forb
 import json
+import os
+import sys
+import threading
+import time
 from urllib.request import urlopen, Request
 from urllib.error import URLError
 
+# orjson parses bytes directly and is faster when available; its
+# JSONDecodeError subclasses json.JSONDecodeError
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 # Cache rates for 60 seconds to avoid hitting rate limits
-_cache = {}
 _cache_time = 0
 CACHE_DURATION = 60  # seconds
 
-def _fetch_rates():
-    """Fetch current rates from CoinGecko API."""
-    global _cache, _cache_time
-    import time
+# Latest USD rates, read directly by the currency functions (None until fetched)
+_BTC_RATE = None
+_ETH_RATE = None
+_SOL_RATE = None
+
+# Once rates have been fetched, a daemon thread keeps them fresh so callers
+# never wait on the network after the first fetch. It stops once rates have
+# gone unread for REFRESH_IDLE_LIMIT intervals.
+REFRESH_INTERVAL = 55  # seconds
+REFRESH_IDLE_LIMIT = 5  # intervals
+_fetch_lock = threading.Lock()
+_refresher = None
+_last_read = 0
 
-    now = time.time()
-    if _cache and (now - _cache_time) < CACHE_DURATION:
-        return _cache
 
+def _rates_file():
+    """Persisted rates, next to the core's exchange_rates.json (dirs::cache_dir())."""
+    if sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    elif os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "formatorbit", "crypto_rates.json")
+
+
+def _load_rates():
+    """Load rates saved by a previous run if they are still within CACHE_DURATION."""
+    global _BTC_RATE, _ETH_RATE, _SOL_RATE, _cache_time
     try:
-        url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,solana&vs_currencies=usd"
-        req = Request(url, headers={"Accept": "application/json"})
-        with urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            _cache = {
-                "BTC": data.get("bitcoin", {}).get("usd"),
-                "ETH": data.get("ethereum", {}).get("usd"),
-                "SOL": data.get("solana", {}).get("usd"),
-            }
-            _cache_time = now
-            return _cache
-    except (URLError, json.JSONDecodeError, KeyError):
-        return _cache  # Return stale cache on error
+        with open(_rates_file(), encoding="utf-8") as f:
+            saved = json.load(f)
+        saved_time = float(saved["time"])
+        btc, eth, sol = saved["BTC"], saved["ETH"], saved["SOL"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+    if 0 <= time.time() - saved_time < CACHE_DURATION:
+        _BTC_RATE, _ETH_RATE, _SOL_RATE = btc, eth, sol
+        _cache_time = saved_time
+
+
+def _save_rates():
+    """Persist the current rates so the next run can skip the fetch. Best effort."""
+    path = _rates_file()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"time": _cache_time, "BTC": _BTC_RATE, "ETH": _ETH_RATE, "SOL": _SOL_RATE}, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _fetch_rates(force=False):
+    """Fetch current rates from CoinGecko API."""
+    global _BTC_RATE, _ETH_RATE, _SOL_RATE, _cache_time
+
+    with _fetch_lock:
+        now = time.time()
+        if not force and (now - _cache_time) < CACHE_DURATION:
+            return
+
+        try:
+            url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,solana&vs_currencies=usd"
+            req = Request(url, headers={"Accept": "application/json"})
+            with urlopen(req, timeout=5) as response:
+                data = _json_loads(response.read())
+                btc = data.get("bitcoin", {}).get("usd")
+                eth = data.get("ethereum", {}).get("usd")
+                sol = data.get("solana", {}).get("usd")
+        except (URLError, json.JSONDecodeError, KeyError):
+            return  # Keep stale rates on error
+
+        _BTC_RATE, _ETH_RATE, _SOL_RATE = btc, eth, sol
+        _cache_time = now
+        _save_rates()
+        _start_refresher()
+
+
+def _read_rates():
+    """Record a rate read; fetch synchronously unless the refresher is running."""
+    global _last_read
+    _last_read = time.time()
+    if _refresher is None:
+        _fetch_rates()
+
+
+def _refresh_loop():
+    global _refresher
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        with _fetch_lock:
+            if time.time() - _last_read > REFRESH_INTERVAL * REFRESH_IDLE_LIMIT:
+                # Nobody is reading rates; the next read fetches and restarts us
+                _refresher = None
+                return
+        try:
+            _fetch_rates(force=True)
+        except Exception:
+            pass  # Keep serving the last good rates
+
+
+def _start_refresher():
+    """Start the background refresh thread (once). Caller holds _fetch_lock."""
+    global _refresher
+    if _refresher is None:
+        _refresher = threading.Thread(target=_refresh_loop, name="forb-crypto-rates", daemon=True)
+        _refresher.start()
+
+
+_load_rates()
 
 
 @forb.currency(code="BTC", symbol="\u20bf", name="Bitcoin", decimals=8)
@@ -54,11 +156,10 @@ def btc_rate():
         forb "1 BTC"      # Shows BTC value in USD, EUR, SEK, etc.
         forb "100 USD"    # Shows USD value in BTC and other currencies
     """
-    rates = _fetch_rates()
-    rate = rates.get("BTC")
-    if rate is None:
+    _read_rates()
+    if _BTC_RATE is None:
         return None
-    return (rate, "USD")  # 1 BTC = rate USD
+    return (_BTC_RATE, "USD")  # 1 BTC = rate USD
 
 
 @forb.currency(code="ETH", symbol="\u039e", name="Ethereum", decimals=8)
@@ -69,11 +170,10 @@ def eth_rate():
     Example:
         forb "10 ETH"
     """
-    rates = _fetch_rates()
-    rate = rates.get("ETH")
-    if rate is None:
+    _read_rates()
+    if _ETH_RATE is None:
         return None
-    return (rate, "USD")  # 1 ETH = rate USD
+    return (_ETH_RATE, "USD")  # 1 ETH = rate USD
 
 
 @forb.currency(code="SOL", symbol="S", name="Solana", decimals=9)
@@ -84,8 +184,7 @@ def sol_rate():
     Example:
         forb "100 SOL"
     """
-    rates = _fetch_rates()
-    rate = rates.get("SOL")
-    if rate is None:
+    _read_rates()
+    if _SOL_RATE is None:
         return None
-    return (rate, "USD")  # 1 SOL = rate USD
+    return (_SOL_RATE, "USD")  # 1 SOL = rate USD
@@ -11,8 +11,21 @@ __forb_plugin__ = {
 }
 
 import forb
+import string
 from forb import CoreValue, Interpretation
 
+_EXAMPLE_PREFIX = "EXAMPLE:"
+_EXAMPLE_PREFIX_LEN = len(_EXAMPLE_PREFIX)
+
+# ROT13 translation table and the characters ROT13 candidates may contain
+_ROT13 = str.maketrans(
+    string.ascii_lowercase + string.ascii_uppercase,
+    string.ascii_lowercase[13:] + string.ascii_lowercase[:13]
+    + string.ascii_uppercase[13:] + string.ascii_uppercase[:13],
+)
+_ROT13_LETTERS = string.ascii_letters.encode("ascii")
+_ROT13_VALID_BYTES = (string.ascii_letters + string.digits + " .,!?'-\"").encode("ascii")
+
 @forb.decoder(
     id="example-format",
     name="Example Custom Format",
@@ -26,11 +39,10 @@ def decode_example(input_str):
         forb "EXAMPLE:hello world"
         -> Parsed as custom format with content "hello world"
     """
-    prefix = "EXAMPLE:"
-    if not input_str.startswith(prefix):
+    if not input_str.startswith(_EXAMPLE_PREFIX):
         return []
 
-    content = input_str[len(prefix):]
+    content = input_str[_EXAMPLE_PREFIX_LEN:]
 
     return [Interpretation(
         value=CoreValue.String(content),
@@ -49,31 +61,21 @@ def decode_rot13(input_str):
     Only triggers if the input looks like it could be ROT13
     (contains only letters, spaces, and common punctuation).
     """
-    import string
-
-    # Quick check: must have at least some letters
-    letter_count = sum(1 for c in input_str if c.isalpha())
-    if letter_count < 3:
+    # Cheapest rejections first: length, then non-ASCII (O(1) for str)
+    if len(input_str) < 3 or not input_str.isascii():
         return []
 
     # Only try if it's mostly letters and common characters
-    valid_chars = set(string.ascii_letters + string.digits + " .,!?'-\"")
-    if not all(c in valid_chars for c in input_str):
+    # (deleting every valid byte must leave nothing behind)
+    encoded = input_str.encode("ascii")
+    if encoded.translate(None, _ROT13_VALID_BYTES):
         return []
 
-    # Decode ROT13
-    def rot13(s):
-        result = []
-        for c in s:
-            if 'a' <= c <= 'z':
-                result.append(chr((ord(c) - ord('a') + 13) % 26 + ord('a')))
-            elif 'A' <= c <= 'Z':
-                result.append(chr((ord(c) - ord('A') + 13) % 26 + ord('A')))
-            else:
-                result.append(c)
-        return ''.join(result)
+    # Must have at least some letters
+    if len(encoded) - len(encoded.translate(None, _ROT13_LETTERS)) < 3:
+        return []
 
-    decoded = rot13(input_str)
+    decoded = input_str.translate(_ROT13)
 
     # Only return if the decoded text looks different
     if decoded == input_str:
@@ -7,85 +7,120 @@ __forb_plugin__ = {
     "name": "Math Extensions",
     "version": "1.0.0",
     "author": "Formatorbit",
-    "description": "Mathematical constants (PI, E, PHI, TAU) and functions (factorial, fib, gcd, lcm)"
+    "description": "Mathematical constants (PI, E, PHI, TAU) and functions (factorial, fib, gcd, lcm, isPrime, sqrt, log, sin, cos, tan)"
 }
 
 import forb
+import functools
 import math
 
+# Precomputed values (expression variables are evaluated on every lookup)
+_PI = math.pi
+_E = math.e
+_PHI = (1 + math.sqrt(5)) / 2
+_TAU = math.tau
+_FACT = tuple(math.factorial(i) for i in range(21))
+_SMALL_PRIMES = tuple(p for p in range(2, 1000) if all(p % q for q in range(2, math.isqrt(p) + 1)))
+_SMALL_PRIME_SET = frozenset(_SMALL_PRIMES)
+# Deterministic Miller-Rabin witnesses for all n < 3.3 * 10^24
+_MR_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
 # Mathematical constants
 
 @forb.expr_var("PI", description="Pi - ratio of circumference to diameter")
 def pi():
-    return math.pi
+    return _PI
 
 @forb.expr_var("E", description="Euler's number - base of natural logarithm")
 def euler():
-    return math.e
+    return _E
 
 @forb.expr_var("PHI", description="Golden ratio - (1 + sqrt(5)) / 2")
 def phi():
-    return (1 + math.sqrt(5)) / 2
+    return _PHI
 
 @forb.expr_var("TAU", description="Tau - 2 * PI (full circle in radians)")
 def tau():
-    return math.tau
+    return _TAU
 
 # Mathematical functions
 
 @forb.expr_func("factorial", description="Calculate n!")
 def factorial(n):
-    return math.factorial(int(n))
+    n = int(n)
+    if 0 <= n < len(_FACT):
+        return _FACT[n]
+    return math.factorial(n)
+
+@functools.lru_cache(maxsize=256)
+def _fib_small(n):
+    a, b = 0, 1
+    for _ in range(n - 1):
+        a, b = b, a + b
+    return b
+
+def _fib_fast(n):
+    # Fast doubling: F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+    a, b = 0, 1  # F(k), F(k+1) for k = 0
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a
 
 @forb.expr_func("fib", description="Fibonacci number at position n")
 def fibonacci(n):
     n = int(n)
     if n <= 1:
         return n
-    a, b = 0, 1
-    for _ in range(n - 1):
-        a, b = b, a + b
-    return b
+    if n > 256:
+        return _fib_fast(n)
+    return _fib_small(n)
 
 @forb.expr_func("gcd", description="Greatest common divisor of two numbers")
 def gcd(a, b):
     return math.gcd(int(a), int(b))
 
-@forb.expr_func("lcm", description="Least common multiple of two numbers")
-def lcm(a, b):
-    a, b = int(a), int(b)
-    return abs(a * b) // math.gcd(a, b) if a and b else 0
+@forb.expr_func("lcm", description="Least common multiple of two or more numbers")
+def lcm(*args):
+    return math.lcm(*map(int, args))
+
+def _miller_rabin(n):
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in _MR_WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
 
 @forb.expr_func("isPrime", description="Check if n is prime (returns 1 or 0)")
 def is_prime(n):
     n = int(n)
     if n < 2:
         return 0
-    for i in range(2, int(n**0.5) + 1):
-        if n % i == 0:
+    if n in _SMALL_PRIME_SET:
+        return 1
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
             return 0
-    return 1
-
-@forb.expr_func("sqrt", description="Square root")
-def sqrt(n):
-    return math.sqrt(float(n))
-
-@forb.expr_func("log", description="Natural logarithm")
-def log(n):
-    return math.log(float(n))
-
-@forb.expr_func("log10", description="Base-10 logarithm")
-def log10(n):
-    return math.log10(float(n))
-
-@forb.expr_func("sin", description="Sine (radians)")
-def sin(n):
-    return math.sin(float(n))
-
-@forb.expr_func("cos", description="Cosine (radians)")
-def cos(n):
-    return math.cos(float(n))
-
-@forb.expr_func("tan", description="Tangent (radians)")
-def tan(n):
-    return math.tan(float(n))
+    # No factor below 1000, so anything under 1000^2 is prime
+    if n < 1_000_000:
+        return 1
+    return 1 if _miller_rabin(n) else 0
+
+# math's C functions accept int and float directly, so register them as-is
+sqrt = forb.expr_func("sqrt", description="Square root")(math.sqrt)
+log = forb.expr_func("log", description="Natural logarithm")(math.log)
+log10 = forb.expr_func("log10", description="Base-10 logarithm")(math.log10)
+sin = forb.expr_func("sin", description="Sine (radians)")(math.sin)
+cos = forb.expr_func("cos", description="Cosine (radians)")(math.cos)
+tan = forb.expr_func("tan", description="Tangent (radians)")(math.tan)